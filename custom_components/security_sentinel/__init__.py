@@ -12,6 +12,7 @@ from homeassistant.core import HomeAssistant, ServiceCall
 import homeassistant.helpers.config_validation as cv
 import voluptuous as vol
 
+from .actions import EmailAlertQueue, close_smtp_pool
 from .const import DOMAIN
 from .coordinator import SecuritySentinelCoordinator
 from .event_monitor import EventMonitor
@@ -74,7 +75,10 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     store = EventStore(hass)
     await store.async_load()
 
-    coordinator = SecuritySentinelCoordinator(hass, entry, store)
+    email_queue = EmailAlertQueue(hass, entry.data)
+    email_queue.async_start()
+
+    coordinator = SecuritySentinelCoordinator(hass, entry, store, email_queue)
     monitor = EventMonitor(hass, entry, coordinator)
     await monitor.async_start()
 
@@ -82,6 +86,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         "coordinator": coordinator,
         "monitor": monitor,
         "store": store,
+        "email_queue": email_queue,
     }
 
     async_register_api(hass)
@@ -123,6 +128,16 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     monitor: EventMonitor | None = data.get("monitor")
     if monitor:
         await monitor.async_stop()
+    coordinator: SecuritySentinelCoordinator | None = data.get("coordinator")
+    if coordinator:
+        await coordinator.async_stop()
+    email_queue: EmailAlertQueue | None = data.get("email_queue")
+    if email_queue:
+        await email_queue.async_stop()
+    await hass.async_add_executor_job(close_smtp_pool)
+    store: EventStore | None = data.get("store")
+    if store:
+        await store.async_close()
 
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
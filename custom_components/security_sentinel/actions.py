@@ -1,27 +1,38 @@
 """Notification and email dispatcher for Security Sentinel."""
 from __future__ import annotations
 
+import asyncio
 import logging
 import smtplib
-from email.mime.multipart import MIMEMultipart
+import ssl
+import threading
+import time
+from dataclasses import dataclass
 from email.mime.text import MIMEText
 from typing import Any
 
+from jinja2 import Template
+
 from homeassistant.core import HomeAssistant
 
 from .const import (
     CONF_EMAIL_RECIPIENT,
+    CONF_NOTIFY_LOW_SEVERITY,
     CONF_NOTIFY_SERVICE,
     CONF_SMTP_HOST,
     CONF_SMTP_PASSWORD,
     CONF_SMTP_PORT,
     CONF_SMTP_USERNAME,
+    DEFAULT_NOTIFY_LOW_SEVERITY,
     DEFAULT_NOTIFY_SERVICE,
     DEFAULT_SMTP_PORT,
     HA_EVENT_NAME,
     SEVERITY_CRITICAL,
     SEVERITY_HIGH,
+    SEVERITY_LOW,
+    SEVERITY_SCORES,
 )
+from .store import public_event
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -32,29 +43,277 @@ SEVERITY_COLORS = {
     "critical": "#9C27B0",
 }
 
+# Keep-alive SMTP connection limits
+SMTP_IDLE_TIMEOUT = 100  # seconds
+SMTP_MAX_MESSAGES = 100  # messages per connection
+SMTP_TIMEOUT = 20  # seconds, per socket operation (connect, NOOP, send)
+
+# Debounce window for coalescing alert emails into digests
+EMAIL_BATCH_WINDOW = 3  # seconds
+# Longest async_stop waits for pending digests before cancelling the consumer
+EMAIL_STOP_TIMEOUT = 30  # seconds
+
+_STOP = object()
+
+# TLS context shared by every STARTTLS handshake (built once at import).
+# Like smtplib's default starttls() context it does not verify the server
+# certificate, so relays with self-signed certificates or addressed by IP
+# keep working.
+_SSL_CONTEXT = ssl.create_default_context()
+_SSL_CONTEXT.check_hostname = False
+_SSL_CONTEXT.verify_mode = ssl.CERT_NONE
+
+_EMAIL_TEMPLATE = Template(
+    """
+    <html><body style="font-family:sans-serif;max-width:600px;margin:auto;">
+    <h2 style="background:{{ color }};color:white;padding:12px;border-radius:6px;">
+      Security Sentinel Alert &mdash; {{ event_type }}{{ count }}
+    </h2>
+    {% for e in events %}
+    {% set geo = e.geo or {} %}
+    {% set sev = e.severity or "low" %}
+    <table style="width:100%;border-collapse:collapse;margin-bottom:12px;">
+      <tr><td style="padding:8px;font-weight:bold;">Severity</td>
+          <td style="padding:8px;"><span style="background:{{ colors.get(sev, "#607D8B") }};color:white;padding:2px 8px;border-radius:4px;">{{ sev | upper }}</span></td></tr>
+      <tr style="background:#f5f5f5;"><td style="padding:8px;font-weight:bold;">Source IP</td>
+          <td style="padding:8px;">{{ e.ip or "N/A" }}</td></tr>
+      <tr><td style="padding:8px;font-weight:bold;">Country</td>
+          <td style="padding:8px;">{{ geo.country or "Unknown" }}</td></tr>
+      <tr style="background:#f5f5f5;"><td style="padding:8px;font-weight:bold;">City</td>
+          <td style="padding:8px;">{{ geo.city or "Unknown" }}</td></tr>
+      <tr><td style="padding:8px;font-weight:bold;">ISP / Org</td>
+          <td style="padding:8px;">{{ geo.org or "Unknown" }}</td></tr>
+      <tr style="background:#f5f5f5;"><td style="padding:8px;font-weight:bold;">Detail</td>
+          <td style="padding:8px;">{{ e.detail or "" }}</td></tr>
+      <tr><td style="padding:8px;font-weight:bold;">Timestamp</td>
+          <td style="padding:8px;">{{ e.timestamp or "" }}</td></tr>
+    </table>
+    {% endfor %}
+    <p style="color:#888;font-size:12px;margin-top:16px;">
+      Sent by Security Sentinel &mdash; Home Assistant Integration
+    </p></body></html>
+    """,
+    autoescape=True,
+)
+
+
+class _SmtpPool:
+    """Keep-alive SMTP connection reused across alert emails.
+
+    Owned by executor threads, hence the threading (not asyncio) lock.
+    """
+
+    def __init__(self) -> None:
+        self.conn: smtplib.SMTP | None = None
+        self.key: tuple[str, int, str] | None = None
+        self.last_used: float = 0.0
+        self.msg_count: int = 0
+        self.lock = threading.Lock()
+
+    def get_or_open(self, config: dict[str, Any]) -> smtplib.SMTP:
+        """Return a healthy connection for *config*, reconnecting if needed.
+
+        Must be called with ``self.lock`` held.
+        """
+        smtp_host = config.get(CONF_SMTP_HOST, "")
+        smtp_port = config.get(CONF_SMTP_PORT, DEFAULT_SMTP_PORT)
+        smtp_user = config.get(CONF_SMTP_USERNAME, "")
+        smtp_pass = config.get(CONF_SMTP_PASSWORD, "")
+        key = (smtp_host, smtp_port, smtp_user)
+
+        if self.conn is not None:
+            stale = (
+                self.key != key
+                or time.monotonic() - self.last_used > SMTP_IDLE_TIMEOUT
+                or self.msg_count >= SMTP_MAX_MESSAGES
+            )
+            if not stale:
+                try:
+                    if self.conn.noop()[0] == 250:
+                        return self.conn
+                except (smtplib.SMTPException, OSError):
+                    pass
+            self.close()
+
+        server = smtplib.SMTP(smtp_host, smtp_port, timeout=SMTP_TIMEOUT)
+        try:
+            server.ehlo()
+            server.starttls(context=_SSL_CONTEXT)
+            if smtp_user and smtp_pass:
+                server.login(smtp_user, smtp_pass)
+        except Exception:
+            server.close()
+            raise
+        self.conn = server
+        self.key = key
+        self.msg_count = 0
+        return server
+
+    def close(self) -> None:
+        """Quit the cached connection, ignoring errors.
+
+        Must be called with ``self.lock`` held.
+        """
+        if self.conn is None:
+            return
+        try:
+            self.conn.quit()
+        except (smtplib.SMTPException, OSError):
+            self.conn.close()
+        self.conn = None
+        self.key = None
+        self.msg_count = 0
+
+
+_smtp_pool = _SmtpPool()
+
+
+def close_smtp_pool() -> None:
+    """Close the cached SMTP connection (blocking — runs in executor)."""
+    with _smtp_pool.lock:
+        _smtp_pool.close()
+
+
+class EmailAlertQueue:
+    """Debounced queue that coalesces alert emails into per-source digests.
+
+    Events queued within ``EMAIL_BATCH_WINDOW`` seconds of each other are
+    grouped by ``(event_type, ip)`` and sent as one email per group, so a
+    brute-force burst produces a single message instead of one per attempt.
+    """
+
+    def __init__(self, hass: HomeAssistant, config: dict[str, Any]) -> None:
+        self._hass = hass
+        self._config = config
+        self._queue: asyncio.Queue[Any] = asyncio.Queue()
+        self._task: asyncio.Task | None = None
+
+    def async_start(self) -> None:
+        """Spawn the background consumer task."""
+        self._task = self._hass.async_create_background_task(
+            self._async_run(), "security_sentinel_email_queue"
+        )
+
+    async def async_stop(self) -> None:
+        """Flush pending emails and wait (bounded) for the consumer to exit."""
+        if self._task is None:
+            return
+        self._queue.put_nowait(_STOP)
+        try:
+            await asyncio.wait_for(self._task, EMAIL_STOP_TIMEOUT)
+        except asyncio.TimeoutError:
+            _LOGGER.warning(
+                "Email alert queue did not drain within %ss; pending alerts dropped",
+                EMAIL_STOP_TIMEOUT,
+            )
+        self._task = None
+
+    def enqueue(self, event: dict[str, Any]) -> None:
+        """Queue *event* for the next email digest."""
+        self._queue.put_nowait(event)
+
+    async def _async_run(self) -> None:
+        """Collect events into debounced batches and send them."""
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            item = await self._queue.get()
+            if item is _STOP:
+                break
+            batch = [item]
+            deadline = loop.time() + EMAIL_BATCH_WINDOW
+            while (remaining := deadline - loop.time()) > 0:
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            await self._async_send_batch(batch)
+
+    async def _async_send_batch(self, batch: list[dict[str, Any]]) -> None:
+        """Group *batch* by (event_type, ip) and send one email per group."""
+        groups: dict[tuple[str, str], list[dict[str, Any]]] = {}
+        for event in batch:
+            key = (event.get("event_type", ""), event.get("ip", "N/A"))
+            groups.setdefault(key, []).append(event)
+        for events in groups.values():
+            try:
+                await self._hass.async_add_executor_job(
+                    _send_email_batch, self._config, events
+                )
+            except Exception as err:  # noqa: BLE001
+                _LOGGER.error("Failed to send email alert: %s", err)
+
+
+@dataclass(frozen=True, slots=True)
+class DispatchConfig:
+    """Action settings resolved once from the config entry."""
+
+    notify_service: str
+    email_enabled: bool
+    notify_low_severity: bool
+
+    @classmethod
+    def from_config(cls, config: dict[str, Any]) -> DispatchConfig:
+        """Build the dispatch settings from config entry data."""
+        notify_service = config.get(CONF_NOTIFY_SERVICE, DEFAULT_NOTIFY_SERVICE)
+        return cls(
+            notify_service=(
+                notify_service
+                if notify_service != "persistent_notification"
+                else ""
+            ),
+            email_enabled=bool(
+                config.get(CONF_SMTP_HOST) and config.get(CONF_EMAIL_RECIPIENT)
+            ),
+            notify_low_severity=config.get(
+                CONF_NOTIFY_LOW_SEVERITY, DEFAULT_NOTIFY_LOW_SEVERITY
+            ),
+        )
+
 
 async def async_dispatch_event(
-    hass: HomeAssistant, config: dict[str, Any], event: dict[str, Any]
+    hass: HomeAssistant,
+    settings: DispatchConfig,
+    event: dict[str, Any],
+    email_queue: EmailAlertQueue | None = None,
+    *,
+    notify: bool = True,
 ) -> None:
-    """Dispatch all configured actions for a security event."""
+    """Dispatch all configured actions for a security event.
+
+    The HA bus event always fires; with *notify* False the notifications
+    and email are skipped.
+    """
     # Always: fire HA bus event
-    hass.bus.async_fire(HA_EVENT_NAME, event)
+    hass.bus.async_fire(HA_EVENT_NAME, public_event(event))
+    if not notify:
+        return
 
-    # Always: persistent notification
-    await _async_persistent_notification(hass, event)
+    severity = event.get("severity", SEVERITY_LOW)
 
-    # Optional: additional notify service
-    notify_service = config.get(CONF_NOTIFY_SERVICE, DEFAULT_NOTIFY_SERVICE)
-    if notify_service and notify_service != "persistent_notification":
-        await _async_send_notify(hass, notify_service, event)
+    # Persistent notification (low severity only when opted in) and
+    # optional additional notify service
+    calls = []
+    if severity != SEVERITY_LOW or settings.notify_low_severity:
+        calls.append(_async_persistent_notification(hass, event))
+    if settings.notify_service:
+        calls.append(_async_send_notify(hass, settings.notify_service, event))
 
-    # High/Critical: SMTP email
-    severity = event.get("severity", "low")
-    if severity in (SEVERITY_HIGH, SEVERITY_CRITICAL):
-        smtp_host = config.get(CONF_SMTP_HOST, "")
-        recipient = config.get(CONF_EMAIL_RECIPIENT, "")
-        if smtp_host and recipient:
-            await hass.async_add_executor_job(_send_email, config, event)
+    # High/Critical: SMTP email (sent by the debounced queue)
+    if (
+        settings.email_enabled
+        and email_queue is not None
+        and severity in (SEVERITY_HIGH, SEVERITY_CRITICAL)
+    ):
+        email_queue.enqueue(event)
+
+    for result in await asyncio.gather(*calls, return_exceptions=True):
+        if isinstance(result, Exception):
+            _LOGGER.error("Failed to send notification: %s", result)
 
 
 async def _async_persistent_notification(
@@ -109,63 +368,58 @@ async def _async_send_notify(
     )
 
 
-def _send_email(config: dict[str, Any], event: dict[str, Any]) -> None:
-    """Send an HTML email alert (blocking — runs in executor)."""
+def _send_email_batch(config: dict[str, Any], events: list[dict[str, Any]]) -> None:
+    """Send one HTML digest email for *events* (blocking — runs in executor).
+
+    All events are expected to share the same event type and source IP.
+    """
     smtp_host = config.get(CONF_SMTP_HOST, "")
-    smtp_port = config.get(CONF_SMTP_PORT, DEFAULT_SMTP_PORT)
     smtp_user = config.get(CONF_SMTP_USERNAME, "")
-    smtp_pass = config.get(CONF_SMTP_PASSWORD, "")
     recipient = config.get(CONF_EMAIL_RECIPIENT, "")
 
-    if not (smtp_host and recipient):
+    if not (smtp_host and recipient) or not events:
         return
 
-    severity = event.get("severity", "low")
+    first = events[0]
+    severity = max(
+        (e.get("severity", "low") for e in events),
+        key=lambda sev: SEVERITY_SCORES.get(sev, 1),
+    )
     color = SEVERITY_COLORS.get(severity, "#607D8B")
-    geo = event.get("geo", {})
+    count = f" ({len(events)} events)" if len(events) > 1 else ""
 
-    html = f"""
-    <html><body style="font-family:sans-serif;max-width:600px;margin:auto;">
-    <h2 style="background:{color};color:white;padding:12px;border-radius:6px;">
-      Security Sentinel Alert &mdash; {event.get('event_type', '')}
-    </h2>
-    <table style="width:100%;border-collapse:collapse;">
-      <tr><td style="padding:8px;font-weight:bold;">Severity</td>
-          <td style="padding:8px;"><span style="background:{color};color:white;padding:2px 8px;border-radius:4px;">{severity.upper()}</span></td></tr>
-      <tr style="background:#f5f5f5;"><td style="padding:8px;font-weight:bold;">Source IP</td>
-          <td style="padding:8px;">{event.get('ip', 'N/A')}</td></tr>
-      <tr><td style="padding:8px;font-weight:bold;">Country</td>
-          <td style="padding:8px;">{geo.get('country', 'Unknown')}</td></tr>
-      <tr style="background:#f5f5f5;"><td style="padding:8px;font-weight:bold;">City</td>
-          <td style="padding:8px;">{geo.get('city', 'Unknown')}</td></tr>
-      <tr><td style="padding:8px;font-weight:bold;">ISP / Org</td>
-          <td style="padding:8px;">{geo.get('org', 'Unknown')}</td></tr>
-      <tr style="background:#f5f5f5;"><td style="padding:8px;font-weight:bold;">Detail</td>
-          <td style="padding:8px;">{event.get('detail', '')}</td></tr>
-      <tr><td style="padding:8px;font-weight:bold;">Timestamp</td>
-          <td style="padding:8px;">{event.get('timestamp', '')}</td></tr>
-    </table>
-    <p style="color:#888;font-size:12px;margin-top:16px;">
-      Sent by Security Sentinel &mdash; Home Assistant Integration
-    </p></body></html>
-    """
+    html = _EMAIL_TEMPLATE.render(
+        events=events,
+        event_type=first.get("event_type", ""),
+        count=count,
+        color=color,
+        colors=SEVERITY_COLORS,
+    )
 
-    msg = MIMEMultipart("alternative")
+    msg = MIMEText(html, "html", "utf-8")
     msg["Subject"] = (
         f"[Security Sentinel] {severity.upper()}: "
-        f"{event.get('event_type', '')} from {event.get('ip', 'N/A')}"
+        f"{first.get('event_type', '')} from {first.get('ip', 'N/A')}{count}"
     )
     msg["From"] = smtp_user or "security-sentinel@homeassistant.local"
     msg["To"] = recipient
-    msg.attach(MIMEText(html, "html"))
 
     try:
-        with smtplib.SMTP(smtp_host, smtp_port) as server:
-            server.ehlo()
-            server.starttls()
-            if smtp_user and smtp_pass:
-                server.login(smtp_user, smtp_pass)
-            server.sendmail(msg["From"], [recipient], msg.as_string())
-            _LOGGER.info("Email alert sent to %s for event %s.", recipient, event.get("event_type"))
+        with _smtp_pool.lock:
+            server = _smtp_pool.get_or_open(config)
+            try:
+                server.send_message(msg)
+            except smtplib.SMTPServerDisconnected:
+                # Server dropped the idle connection between NOOP and send
+                _smtp_pool.close()
+                server = _smtp_pool.get_or_open(config)
+                server.send_message(msg)
+            _smtp_pool.last_used = time.monotonic()
+            _smtp_pool.msg_count += 1
+        _LOGGER.info(
+            "Email alert sent to %s for %d %s event(s).",
+            recipient, len(events), first.get("event_type"),
+        )
     except Exception as err:  # noqa: BLE001
         _LOGGER.error("Failed to send email alert: %s", err)
+
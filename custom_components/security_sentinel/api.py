@@ -10,7 +10,7 @@ from homeassistant.core import HomeAssistant, callback
 
 from .const import DOMAIN, MAP_EVENTS_HOURS, MAP_EVENTS_LIMIT
 from .coordinator import SecuritySentinelCoordinator
-from .store import EventStore
+from .store import EventStore, public_event
 
 
 @callback
@@ -55,7 +55,7 @@ def ws_get_map_data(
     connection.send_result(
         msg["id"],
         {
-            "map_events": map_events,
+            "map_events": [public_event(e) for e in map_events],
             "traces": traces,
         },
     )
@@ -85,7 +85,7 @@ def ws_get_banned_dossier(
         msg["id"],
         {
             "ip": ip,
-            "events": ip_events[:20],
+            "events": [public_event(e) for e in ip_events[:20]],
             "traceroute_hops": store.get_traceroute(ip),
             "geo": store.get_latest_geo_for_ip(ip),
         },
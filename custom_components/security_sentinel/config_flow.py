@@ -14,6 +14,7 @@ from .const import (
     CONF_EMAIL_RECIPIENT,
     CONF_FAILED_LOGIN_THRESHOLD,
     CONF_GEO_API_KEY,
+    CONF_NOTIFY_LOW_SEVERITY,
     CONF_NOTIFY_SERVICE,
     CONF_SCAN_INTERVAL,
     CONF_SMTP_HOST,
@@ -22,6 +23,7 @@ from .const import (
     CONF_SMTP_USERNAME,
     DEFAULT_BRUTE_FORCE_WINDOW,
     DEFAULT_FAILED_LOGIN_THRESHOLD,
+    DEFAULT_NOTIFY_LOW_SEVERITY,
     DEFAULT_NOTIFY_SERVICE,
     DEFAULT_SCAN_INTERVAL,
     DEFAULT_SMTP_PORT,
@@ -42,6 +44,9 @@ STEP_USER_SCHEMA = vol.Schema(
             CONF_BRUTE_FORCE_WINDOW, default=DEFAULT_BRUTE_FORCE_WINDOW
         ): vol.All(int, vol.Range(min=10, max=3600)),
         vol.Optional(CONF_NOTIFY_SERVICE, default=DEFAULT_NOTIFY_SERVICE): str,
+        vol.Optional(
+            CONF_NOTIFY_LOW_SEVERITY, default=DEFAULT_NOTIFY_LOW_SEVERITY
+        ): bool,
         vol.Optional(CONF_GEO_API_KEY, default=""): str,
     }
 )
@@ -114,6 +119,7 @@ class SecuritySentinelOptionsFlow(config_entries.OptionsFlow):
                 vol.Required(CONF_FAILED_LOGIN_THRESHOLD, default=c.get(CONF_FAILED_LOGIN_THRESHOLD, DEFAULT_FAILED_LOGIN_THRESHOLD)): vol.All(int, vol.Range(min=2, max=100)),
                 vol.Required(CONF_BRUTE_FORCE_WINDOW, default=c.get(CONF_BRUTE_FORCE_WINDOW, DEFAULT_BRUTE_FORCE_WINDOW)): vol.All(int, vol.Range(min=10, max=3600)),
                 vol.Optional(CONF_NOTIFY_SERVICE, default=c.get(CONF_NOTIFY_SERVICE, DEFAULT_NOTIFY_SERVICE)): str,
+                vol.Optional(CONF_NOTIFY_LOW_SEVERITY, default=c.get(CONF_NOTIFY_LOW_SEVERITY, DEFAULT_NOTIFY_LOW_SEVERITY)): bool,
                 vol.Optional(CONF_GEO_API_KEY, default=c.get(CONF_GEO_API_KEY, "")): str,
                 vol.Optional(CONF_EMAIL_RECIPIENT, default=c.get(CONF_EMAIL_RECIPIENT, "")): str,
                 vol.Optional(CONF_SMTP_HOST, default=c.get(CONF_SMTP_HOST, "")): str,
@@ -1,4 +1,5 @@
 """Constants for Security Sentinel integration."""
+import ipaddress
 import json
 from pathlib import Path
 
@@ -19,6 +20,7 @@ CONF_SMTP_PORT = "smtp_port"
 CONF_SMTP_USERNAME = "smtp_username"
 CONF_SMTP_PASSWORD = "smtp_password"
 CONF_GEO_API_KEY = "geo_api_key"
+CONF_NOTIFY_LOW_SEVERITY = "notify_low_severity"
 
 # Defaults
 DEFAULT_SCAN_INTERVAL = 60
@@ -26,6 +28,7 @@ DEFAULT_FAILED_LOGIN_THRESHOLD = 5
 DEFAULT_BRUTE_FORCE_WINDOW = 60
 DEFAULT_NOTIFY_SERVICE = "persistent_notification"
 DEFAULT_SMTP_PORT = 587
+DEFAULT_NOTIFY_LOW_SEVERITY = True
 
 # Event types
 EVENT_AUTH_FAILED = "AUTH_FAILED"
@@ -60,6 +63,7 @@ HA_EVENT_NAME = "security_sentinel_event"
 # Storage
 STORAGE_KEY = f"{DOMAIN}.events"
 STORAGE_VERSION = 1
+JOURNAL_FILENAME = f"{DOMAIN}.events.jsonl"
 
 # Sensor keys
 SENSOR_FAILED_LOGINS = "failed_logins"
@@ -67,20 +71,29 @@ SENSOR_LAST_EVENT = "last_event"
 SENSOR_THREAT_LEVEL = "threat_level"
 SENSOR_BANNED_IPS = "banned_ips"
 
-# Suspicious services to monitor
-SUSPICIOUS_SERVICES = [
+# Suspicious services to monitor (checked on every HA service call)
+SUSPICIOUS_DOMAINS = frozenset({
     "shell_command",
     "python_script",
+})
+SUSPICIOUS_SERVICES = frozenset({
     "homeassistant.restart",
     "homeassistant.stop",
-]
+})
 
-# Private/local IP prefixes
-PRIVATE_IP_PREFIXES = (
-    "10.", "172.16.", "172.17.", "172.18.", "172.19.",
-    "172.20.", "172.21.", "172.22.", "172.23.", "172.24.",
-    "172.25.", "172.26.", "172.27.", "172.28.", "172.29.",
-    "172.30.", "172.31.", "192.168.", "127.", "::1", "fe80:",
+# Private/local networks that are never geolocated
+PRIVATE_NETWORKS = tuple(
+    ipaddress.ip_network(net)
+    for net in (
+        "10.0.0.0/8",
+        "172.16.0.0/12",
+        "192.168.0.0/16",
+        "127.0.0.0/8",
+        "169.254.0.0/16",
+        "::1/128",
+        "fe80::/10",
+        "fc00::/7",
+    )
 )
 
 # Map tab: event window and limit for 30-day history
@@ -1,7 +1,10 @@
 """DataUpdateCoordinator for Security Sentinel."""
 from __future__ import annotations
 
+import asyncio
+import bisect
 import logging
+import time
 from datetime import timedelta
 from pathlib import Path
 from typing import Any
@@ -12,7 +15,7 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
-from .actions import async_dispatch_event
+from .actions import DispatchConfig, EmailAlertQueue, async_dispatch_event
 from .const import (
     CONF_GEO_API_KEY,
     CONF_SCAN_INTERVAL,
@@ -26,19 +29,33 @@ from .const import (
     THREAT_THRESHOLDS,
 )
 from .geo_lookup import async_get_geo_info
-from .store import EventStore
+from .store import EventStore, public_event
 from .traceroute import async_traceroute_to_ip
 
 _LOGGER = logging.getLogger(__name__)
 
 
-def _calculate_threat_level(events: list[dict[str, Any]]) -> str:
-    """Compute threat level from recent event severities."""
-    score = sum(SEVERITY_SCORES.get(e.get("severity", "low"), 1) for e in events)
-    for threshold, level in THREAT_THRESHOLDS:
-        if score >= threshold:
-            return level
-    return "low"
+# Rolling window used for the sensor metrics
+METRICS_WINDOW = 24 * 3600  # seconds
+METRICS_BUCKET = 60  # seconds; the window is summed in fixed per-minute slots
+_METRICS_SLOTS = METRICS_WINDOW // METRICS_BUCKET
+RECENT_EVENTS_LIMIT = 10  # newest events exposed as sensor attributes
+
+# Concurrent async_process_event calls allowed at once
+MAX_CONCURRENT_EVENTS = 8
+# Repeated AUTH_FAILED events from one IP within this window are stored and
+# fired on the bus but send no notification or email; the brute-force
+# detector still sees every attempt
+AUTH_FAILED_COALESCE_WINDOW = 1.0  # seconds
+
+# THREAT_THRESHOLDS split into ascending parallel sequences for bisect
+_THRESHOLD_SCORES, _THRESHOLD_LEVELS = zip(*sorted(THREAT_THRESHOLDS))
+
+
+def _calculate_threat_level(score: int) -> str:
+    """Compute threat level from the summed severity score of recent events."""
+    idx = bisect.bisect_right(_THRESHOLD_SCORES, score) - 1
+    return _THRESHOLD_LEVELS[idx] if idx >= 0 else "low"
 
 
 class SecuritySentinelCoordinator(DataUpdateCoordinator):
@@ -49,6 +66,7 @@ class SecuritySentinelCoordinator(DataUpdateCoordinator):
         hass: HomeAssistant,
         entry: ConfigEntry,
         store: EventStore,
+        email_queue: EmailAlertQueue,
     ) -> None:
         scan_interval = entry.data.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
         super().__init__(
@@ -59,21 +77,94 @@ class SecuritySentinelCoordinator(DataUpdateCoordinator):
         )
         self._entry = entry
         self._store = store
+        self._email_queue = email_queue
+        self._dispatch_config = DispatchConfig.from_config(entry.data)
+        self._process_sem = asyncio.Semaphore(MAX_CONCURRENT_EVENTS)
+        # {ip: monotonic time of the last AUTH_FAILED notification}
+        self._auth_failed_notified: dict[str, float] = {}
+        # Background traceroute tasks, cancelled on unload
+        self._traceroute_tasks: set[asyncio.Task] = set()
+        # Incrementally maintained 24h metrics in a ring of per-minute slots,
+        # so memory stays constant however many events arrive.  Each slot
+        # holds its absolute bucket number (-1 when empty), score and fails.
+        self._slot_buckets = [-1] * _METRICS_SLOTS
+        self._slot_scores = [0] * _METRICS_SLOTS
+        self._slot_fails = [0] * _METRICS_SLOTS
+        self._score_24h = 0
+        self._fails_24h = 0
+        # Seeded from the store, which only holds the newest MAX_STORED_EVENTS
+        now = time.time()
+        for event in store.get_recent_events(
+            hours=24, limit=store.count_events(), now=now
+        ):
+            self._track_event(event, now)
+
+    def _track_event(self, event: dict[str, Any], now: float) -> None:
+        """Add a stored *event* (already stamped with ``_ts``) to the 24h metrics."""
+        current = int(now // METRICS_BUCKET)
+        # Clamp timestamps from a clock that was ahead to the current bucket
+        bucket = min(int(event.get("_ts", 0.0) // METRICS_BUCKET), current)
+        if bucket <= current - _METRICS_SLOTS:
+            return
+        slot = bucket % _METRICS_SLOTS
+        if self._slot_buckets[slot] != bucket:
+            self._clear_slot(slot)
+            self._slot_buckets[slot] = bucket
+        score = SEVERITY_SCORES.get(event.get("severity", "low"), 1)
+        auth_failed = event.get("event_type") == EVENT_AUTH_FAILED
+        self._slot_scores[slot] += score
+        self._slot_fails[slot] += auth_failed
+        self._score_24h += score
+        self._fails_24h += auth_failed
+
+    def _expire_events(self, now: float) -> None:
+        """Drop slots older than the metrics window from the running totals."""
+        oldest = int(now // METRICS_BUCKET) - _METRICS_SLOTS
+        for slot, bucket in enumerate(self._slot_buckets):
+            if 0 <= bucket <= oldest:
+                self._clear_slot(slot)
+
+    def _clear_slot(self, slot: int) -> None:
+        self._score_24h -= self._slot_scores[slot]
+        self._fails_24h -= self._slot_fails[slot]
+        self._slot_buckets[slot] = -1
+        self._slot_scores[slot] = 0
+        self._slot_fails[slot] = 0
+
+    def _should_notify(self, event: dict[str, Any]) -> bool:
+        """Return False for an AUTH_FAILED repeating an IP inside the coalesce window."""
+        if event.get("event_type") != EVENT_AUTH_FAILED:
+            return True
+        ip = event.get("ip", "")
+        now = time.monotonic()
+        last = self._auth_failed_notified.get(ip)
+        if last is not None and now - last < AUTH_FAILED_COALESCE_WINDOW:
+            return False
+        self._auth_failed_notified[ip] = now
+        return True
 
     async def _async_update_data(self) -> dict[str, Any]:
         """Aggregate current security metrics for sensor entities."""
-        recent = self._store.get_recent_events(hours=24)
-        last = self._store.get_last_event()
-        failed_logins = self._store.count_failed_logins(hours=24)
-        threat_level = _calculate_threat_level(recent)
+        now = time.time()
+        self._expire_events(now)
+        cutoff = time.monotonic() - AUTH_FAILED_COALESCE_WINDOW
+        self._auth_failed_notified = {
+            ip: ts for ip, ts in self._auth_failed_notified.items() if ts >= cutoff
+        }
         raw_banned = await self.hass.async_add_executor_job(self._read_banned_ips)
         banned_ips = await self._async_enrich_banned_ips(raw_banned)
+        last_event = self._store.get_last_event()
         return {
-            "failed_logins": failed_logins,
-            "last_event": last,
-            "threat_level": threat_level,
-            "recent_events": recent,
-            "total_events": len(self._store.get_all_events()),
+            "failed_logins": self._fails_24h,
+            "last_event": public_event(last_event) if last_event else None,
+            "threat_level": _calculate_threat_level(self._score_24h),
+            "recent_events": [
+                public_event(e)
+                for e in self._store.get_recent_events(
+                    hours=24, limit=RECENT_EVENTS_LIMIT, now=now
+                )
+            ],
+            "total_events": self._store.count_events(),
             "banned_ips": banned_ips,
         }
 
@@ -121,16 +212,34 @@ class SecuritySentinelCoordinator(DataUpdateCoordinator):
             })
         return enriched
 
+    async def async_stop(self) -> None:
+        """Cancel background traceroutes so none finish after unload."""
+        tasks = list(self._traceroute_tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
     async def async_process_event(self, event: dict[str, Any]) -> None:
         """Enrich, store, dispatch, and refresh sensors for a new security event."""
+        async with self._process_sem:
+            await self._async_process_event(event)
+
+    async def _async_process_event(self, event: dict[str, Any]) -> None:
         ip = event.get("ip", "")
         if ip and ip not in ("internal", "N/A", ""):
             geo_api_key = self._entry.data.get(CONF_GEO_API_KEY, "")
             event["geo"] = await async_get_geo_info(self.hass, ip, geo_api_key)
 
         self._store.add_event(event)
-        await self._store.async_save()
-        await async_dispatch_event(self.hass, self._entry.data, event)
+        self._track_event(event, time.time())
+        self._store.schedule_save()
+        await async_dispatch_event(
+            self.hass,
+            self._dispatch_config,
+            event,
+            self._email_queue,
+            notify=self._should_notify(event),
+        )
         await self.async_request_refresh()
 
         # Schedule a background traceroute for the first attack from each
@@ -142,7 +251,9 @@ class SecuritySentinelCoordinator(DataUpdateCoordinator):
             and event_type in (EVENT_AUTH_FAILED, EVENT_BRUTE_FORCE)
             and not self._store.get_traceroute(ip)
         ):
-            self.hass.async_create_task(self._async_run_traceroute(ip))
+            task = self.hass.async_create_task(self._async_run_traceroute(ip))
+            self._traceroute_tasks.add(task)
+            task.add_done_callback(self._traceroute_tasks.discard)
 
         _LOGGER.info(
             "Security event: %s from %s [%s]",
@@ -159,7 +270,7 @@ class SecuritySentinelCoordinator(DataUpdateCoordinator):
             hops = await async_traceroute_to_ip(self.hass, ip, geo_api_key)
             if hops:
                 self._store.set_traceroute(ip, hops)
-                await self._store.async_save()
+                self._store.schedule_save()
                 await self.async_request_refresh()
                 _LOGGER.debug(
                     "Traceroute for %s completed: %d hops recorded", ip, len(hops)
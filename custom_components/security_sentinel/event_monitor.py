@@ -1,15 +1,20 @@
 """HA event bus monitor with brute-force detection state machine."""
 from __future__ import annotations
 
+import asyncio
+import functools
+import heapq
 import ipaddress
 import logging
-from collections import defaultdict
-from datetime import datetime, timezone
-from typing import Any, Callable
+import time
+from collections import defaultdict, deque
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Coroutine
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import Event, HomeAssistant, callback
 from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.event import async_track_time_interval
 
 from .const import (
     CONF_BRUTE_FORCE_WINDOW,
@@ -24,12 +29,17 @@ from .const import (
     SEVERITY_HIGH,
     SEVERITY_LOW,
     SEVERITY_MEDIUM,
+    SUSPICIOUS_DOMAINS,
     SUSPICIOUS_SERVICES,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
+# Hard cap on IPs tracked by the brute-force detector
+BF_MAX_TRACKED_IPS = 10000
 
+
+@functools.lru_cache(maxsize=4096)
 def _is_external(ip: str) -> bool:
     """Return True if the IP is a routable (non-private) address."""
     try:
@@ -51,9 +61,16 @@ class EventMonitor:
         self._entry = entry
         self._coordinator = coordinator
         self._unsub_handlers: list[Callable] = []
-        # Brute-force state: {ip: [unix_timestamps]}
-        self._bf_timestamps: dict[str, list[float]] = defaultdict(list)
+        # Brute-force state: {ip: deque of unix timestamps, oldest first}
+        threshold = entry.data.get(
+            CONF_FAILED_LOGIN_THRESHOLD, DEFAULT_FAILED_LOGIN_THRESHOLD
+        )
+        self._bf_timestamps: dict[str, deque[float]] = defaultdict(
+            lambda: deque(maxlen=threshold * 2)
+        )
         self._known_device_ids: set[str] = set()
+        # In-flight event processing tasks, cancelled on stop
+        self._tasks: set[asyncio.Task] = set()
 
     async def async_start(self) -> None:
         """Subscribe to HA event bus topics."""
@@ -70,15 +87,53 @@ class EventMonitor:
                 "device_registry_updated", self._handle_device_registry
             )
         )
+        window = self._entry.data.get(
+            CONF_BRUTE_FORCE_WINDOW, DEFAULT_BRUTE_FORCE_WINDOW
+        )
+        self._unsub_handlers.append(
+            async_track_time_interval(
+                self._hass, self._async_gc_bf_state, timedelta(seconds=window)
+            )
+        )
         _LOGGER.debug("EventMonitor started.")
 
     async def async_stop(self) -> None:
-        """Unsubscribe all event handlers."""
+        """Unsubscribe all event handlers and cancel in-flight events."""
         for unsub in self._unsub_handlers:
             unsub()
         self._unsub_handlers.clear()
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
         _LOGGER.debug("EventMonitor stopped.")
 
+    @callback
+    def _spawn(self, coro: Coroutine[Any, Any, None]) -> None:
+        """Run *coro* as a task that is cancelled when the monitor stops."""
+        task = self._hass.async_create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    @callback
+    def _async_gc_bf_state(self, _now: datetime) -> None:
+        """Drop brute-force state for IPs that have gone quiet."""
+        window = self._entry.data.get(
+            CONF_BRUTE_FORCE_WINDOW, DEFAULT_BRUTE_FORCE_WINDOW
+        )
+        now = time.time()
+        for ip, timestamps in list(self._bf_timestamps.items()):
+            if not timestamps or now - timestamps[-1] > 2 * window:
+                del self._bf_timestamps[ip]
+
+        excess = len(self._bf_timestamps) - BF_MAX_TRACKED_IPS
+        if excess > 0:
+            evict = max(excess, BF_MAX_TRACKED_IPS // 10)
+            for ip in heapq.nsmallest(
+                evict, self._bf_timestamps, key=lambda k: self._bf_timestamps[k][-1]
+            ):
+                del self._bf_timestamps[ip]
+
     @callback
     def _handle_login_event(self, event: Event) -> None:
         """Handle a failed login event from HA auth."""
@@ -92,19 +147,19 @@ class EventMonitor:
         domain = event.data.get("domain", "")
         service = event.data.get("service", "")
         full = f"{domain}.{service}"
-        if full in SUSPICIOUS_SERVICES or domain in ("shell_command", "python_script"):
+        if domain in SUSPICIOUS_DOMAINS or full in SUSPICIOUS_SERVICES:
             user_id = getattr(event.context, "user_id", None)
+            now = time.time()
             sec_event = {
                 "event_type": EVENT_SUSPICIOUS_SERVICE,
                 "ip": "internal",
                 "detail": f"Sensitive service called: {full} by user_id={user_id}",
                 "severity": SEVERITY_HIGH,
-                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "timestamp": datetime.fromtimestamp(now, tz=timezone.utc).isoformat(),
+                "_ts": now,
                 "geo": {"country": "Local", "city": "Internal"},
             }
-            self._hass.async_create_task(
-                self._coordinator.async_process_event(sec_event)
-            )
+            self._spawn(self._coordinator.async_process_event(sec_event))
 
     @callback
     def _handle_device_registry(self, event: Event) -> None:
@@ -133,61 +188,62 @@ class EventMonitor:
                         device_info["entry_type"] = str(device.entry_type)
                         detail_parts.append(f"Type: {device.entry_type}")
 
+                now = time.time()
                 sec_event = {
                     "event_type": EVENT_NEW_DEVICE,
                     "ip": "N/A",
                     "detail": ", ".join(detail_parts),
                     "device_info": device_info,
                     "severity": SEVERITY_LOW,
-                    "timestamp": datetime.now(timezone.utc).isoformat(),
+                    "timestamp": datetime.fromtimestamp(
+                        now, tz=timezone.utc
+                    ).isoformat(),
+                    "_ts": now,
                     "geo": {"country": "Local", "city": "Internal"},
                 }
-                self._hass.async_create_task(
-                    self._coordinator.async_process_event(sec_event)
-                )
+                self._spawn(self._coordinator.async_process_event(sec_event))
 
     def _process_auth_failed(self, ip: str) -> None:
         """Record AUTH_FAILED and fire BRUTE_FORCE if threshold is reached."""
-        now = datetime.now(timezone.utc).timestamp()
+        now = time.time()
+        ts_iso = datetime.fromtimestamp(now, tz=timezone.utc).isoformat()
         config = self._entry.data
         threshold = config.get(CONF_FAILED_LOGIN_THRESHOLD, DEFAULT_FAILED_LOGIN_THRESHOLD)
         window = config.get(CONF_BRUTE_FORCE_WINDOW, DEFAULT_BRUTE_FORCE_WINDOW)
 
-        attempt_count = len(self._bf_timestamps[ip]) + 1
+        timestamps = self._bf_timestamps[ip]
+        attempt_count = len(timestamps) + 1
+        external = _is_external(ip)
         auth_event: dict[str, Any] = {
             "event_type": EVENT_AUTH_FAILED,
             "ip": ip,
-            "detail": f"Failed login attempt #{attempt_count}",
-            "severity": SEVERITY_HIGH if _is_external(ip) else SEVERITY_MEDIUM,
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "detail": f"Failed login attempt #{attempt_count}"
+            + (" (external IP)" if external else ""),
+            "severity": SEVERITY_HIGH if external else SEVERITY_MEDIUM,
+            "timestamp": ts_iso,
+            "_ts": now,
             "geo": {},
         }
-        if _is_external(ip):
-            auth_event["detail"] += " (external IP)"
 
-        self._hass.async_create_task(
-            self._coordinator.async_process_event(auth_event)
-        )
+        self._spawn(self._coordinator.async_process_event(auth_event))
 
         # Sliding-window brute-force check
-        self._bf_timestamps[ip] = [
-            ts for ts in self._bf_timestamps[ip] if now - ts <= window
-        ]
-        self._bf_timestamps[ip].append(now)
+        while timestamps and now - timestamps[0] > window:
+            timestamps.popleft()
+        timestamps.append(now)
 
-        if len(self._bf_timestamps[ip]) >= threshold:
+        if len(timestamps) >= threshold:
             bf_event: dict[str, Any] = {
                 "event_type": EVENT_BRUTE_FORCE,
                 "ip": ip,
                 "detail": (
-                    f"Brute-force detected: {len(self._bf_timestamps[ip])} "
+                    f"Brute-force detected: {len(timestamps)} "
                     f"attempts in {window}s"
                 ),
                 "severity": SEVERITY_CRITICAL,
-                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "timestamp": ts_iso,
+                "_ts": now,
                 "geo": {},
             }
-            self._bf_timestamps[ip].clear()
-            self._hass.async_create_task(
-                self._coordinator.async_process_event(bf_event)
-            )
+            timestamps.clear()
+            self._spawn(self._coordinator.async_process_event(bf_event))
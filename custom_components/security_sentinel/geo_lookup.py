@@ -2,41 +2,63 @@
 from __future__ import annotations
 
 import asyncio
+import functools
+import ipaddress
 import logging
 import time
+from collections import OrderedDict
 from typing import Any
 
 import aiohttp
 
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
-from .const import PRIVATE_IP_PREFIXES
+from .const import PRIVATE_NETWORKS
 
 _LOGGER = logging.getLogger(__name__)
 
 CACHE_TTL = 3600  # seconds
-_cache: dict[str, tuple[dict[str, Any], float]] = {}
-_lock = asyncio.Lock()
+LOOKUP_TIMEOUT = 5  # seconds, per provider
+# ip-api.com answers alone for this long before ipinfo.io is also queried
+IPINFO_HEAD_START = 1.0  # seconds
+CACHE_MAX_SIZE = 1000
+# LRU order: least recently used first
+_cache: OrderedDict[str, tuple[dict[str, Any], float]] = OrderedDict()
+# In-flight lookups keyed by IP; concurrent callers await the same future
+_inflight: dict[str, asyncio.Future[dict[str, Any]]] = {}
 
 
+@functools.lru_cache(maxsize=4096)
 def _is_private(ip: str) -> bool:
     """Return True if the IP is a private/loopback address."""
-    return not ip or ip.startswith(PRIVATE_IP_PREFIXES)
+    if not ip:
+        return True
+    try:
+        addr = ipaddress.ip_address(ip)
+    except ValueError:
+        return False
+    if isinstance(addr, ipaddress.IPv6Address) and addr.ipv4_mapped:
+        addr = addr.ipv4_mapped
+    return any(addr in net for net in PRIVATE_NETWORKS)
 
 
 def _get_cached(ip: str) -> dict[str, Any] | None:
     entry = _cache.get(ip)
-    if entry and time.monotonic() - entry[1] < CACHE_TTL:
-        return entry[0]
-    return None
+    if entry is None:
+        return None
+    if time.monotonic() - entry[1] >= CACHE_TTL:
+        del _cache[ip]
+        return None
+    _cache.move_to_end(ip)
+    return entry[0]
 
 
 def _set_cache(ip: str, data: dict[str, Any]) -> None:
     _cache[ip] = (data, time.monotonic())
-    if len(_cache) > 1000:
-        oldest = sorted(_cache, key=lambda k: _cache[k][1])
-        for key in oldest[:100]:
-            del _cache[key]
+    _cache.move_to_end(ip)
+    while len(_cache) > CACHE_MAX_SIZE:
+        _cache.popitem(last=False)
 
 
 async def async_get_geo_info(
@@ -46,70 +68,121 @@ async def async_get_geo_info(
     if _is_private(ip):
         return {"country": "Local", "country_code": "LO", "city": "Local Network", "org": "Local"}
 
-    async with _lock:
+    while True:
         cached = _get_cached(ip)
         if cached:
             return cached
-
-    result = await _fetch_ip_api(ip)
-    if not result:
-        result = await _fetch_ipinfo(ip, api_key)
-    if not result:
-        result = {"country": "Unknown", "country_code": "??", "city": "Unknown", "org": "Unknown"}
-
-    _set_cache(ip, result)
-    return result
-
-
-async def _fetch_ip_api(ip: str) -> dict[str, Any] | None:
+        fut = _inflight.get(ip)
+        if fut is None:
+            break
+        try:
+            return await asyncio.shield(fut)
+        except asyncio.CancelledError:
+            # Re-raise our own cancellation; if the leading lookup was
+            # cancelled instead, retry (possibly becoming the leader)
+            if not fut.cancelled() or asyncio.current_task().cancelling():
+                raise
+
+    fut = asyncio.get_running_loop().create_future()
+    _inflight[ip] = fut
+    try:
+        session = async_get_clientsession(hass)
+        found = await _race_providers(session, ip, api_key)
+        result: dict[str, Any] = found or {"country": "Unknown", "country_code": "??", "city": "Unknown", "org": "Unknown"}
+        _set_cache(ip, result)
+        fut.set_result(result)
+        return result
+    finally:
+        _inflight.pop(ip, None)
+        if not fut.done():
+            # Cancelled or failed: waiters retry rather than record a placeholder
+            fut.cancel()
+
+
+async def _race_providers(
+    session: aiohttp.ClientSession, ip: str, api_key: str
+) -> dict[str, Any] | None:
+    """Query ip-api.com, bringing in ipinfo.io only when it is slow or fails.
+
+    ipinfo.io is started once ip-api.com has failed or not answered within
+    ``IPINFO_HEAD_START`` seconds; after that the first successful result
+    wins, preferring ip-api.com when both are ready.
+    """
+    tasks = [asyncio.create_task(_fetch_ip_api(session, ip))]
+    pending: set[asyncio.Task] = set(tasks)
+    try:
+        done, pending = await asyncio.wait(pending, timeout=IPINFO_HEAD_START)
+        if done and tasks[0].result():
+            return tasks[0].result()
+        tasks.append(asyncio.create_task(_fetch_ipinfo(session, ip, api_key)))
+        pending.add(tasks[-1])
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, timeout=LOOKUP_TIMEOUT, return_when=asyncio.FIRST_COMPLETED
+            )
+            if not done:
+                break
+            result = next((t.result() for t in tasks if t in done and t.result()), None)
+            if result is not None:
+                return result
+        return None
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+
+async def _fetch_ip_api(
+    session: aiohttp.ClientSession, ip: str
+) -> dict[str, Any] | None:
     """Fetch geo data from ip-api.com (free, no key required)."""
     url = (
         f"http://ip-api.com/json/{ip}"
         "?fields=status,country,countryCode,region,city,org,isp,lat,lon,timezone"
     )
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, timeout=aiohttp.ClientTimeout(total=5)) as resp:
-                if resp.status == 200:
-                    data = await resp.json(content_type=None)
-                    if data.get("status") == "success":
-                        return {
-                            "country": data.get("country", ""),
-                            "country_code": data.get("countryCode", ""),
-                            "region": data.get("region", ""),
-                            "city": data.get("city", ""),
-                            "org": data.get("org", ""),
-                            "isp": data.get("isp", ""),
-                            "lat": data.get("lat"),
-                            "lon": data.get("lon"),
-                            "timezone": data.get("timezone", ""),
-                        }
+        async with session.get(url, timeout=aiohttp.ClientTimeout(total=LOOKUP_TIMEOUT)) as resp:
+            if resp.status == 200:
+                data = await resp.json(content_type=None)
+                if data.get("status") == "success":
+                    return {
+                        "country": data.get("country", ""),
+                        "country_code": data.get("countryCode", ""),
+                        "region": data.get("region", ""),
+                        "city": data.get("city", ""),
+                        "org": data.get("org", ""),
+                        "isp": data.get("isp", ""),
+                        "lat": data.get("lat"),
+                        "lon": data.get("lon"),
+                        "timezone": data.get("timezone", ""),
+                    }
     except Exception as err:  # noqa: BLE001
         _LOGGER.debug("ip-api.com lookup failed for %s: %s", ip, err)
     return None
 
 
-async def _fetch_ipinfo(ip: str, api_key: str) -> dict[str, Any] | None:
+async def _fetch_ipinfo(
+    session: aiohttp.ClientSession, ip: str, api_key: str
+) -> dict[str, Any] | None:
     """Fetch geo data from ipinfo.io (optional API key for higher limits)."""
     token = f"?token={api_key}" if api_key else ""
     url = f"https://ipinfo.io/{ip}/json{token}"
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, timeout=aiohttp.ClientTimeout(total=5)) as resp:
-                if resp.status == 200:
-                    data = await resp.json(content_type=None)
-                    loc = data.get("loc", ",").split(",")
-                    return {
-                        "country": data.get("country", ""),
-                        "country_code": data.get("country", ""),
-                        "region": data.get("region", ""),
-                        "city": data.get("city", ""),
-                        "org": data.get("org", ""),
-                        "isp": data.get("org", ""),
-                        "lat": float(loc[0]) if len(loc) == 2 else None,
-                        "lon": float(loc[1]) if len(loc) == 2 else None,
-                        "timezone": data.get("timezone", ""),
-                    }
+        async with session.get(url, timeout=aiohttp.ClientTimeout(total=LOOKUP_TIMEOUT)) as resp:
+            if resp.status == 200:
+                data = await resp.json(content_type=None)
+                loc = data.get("loc", ",").split(",")
+                return {
+                    "country": data.get("country", ""),
+                    "country_code": data.get("country", ""),
+                    "region": data.get("region", ""),
+                    "city": data.get("city", ""),
+                    "org": data.get("org", ""),
+                    "isp": data.get("org", ""),
+                    "lat": float(loc[0]) if len(loc) == 2 else None,
+                    "lon": float(loc[1]) if len(loc) == 2 else None,
+                    "timezone": data.get("timezone", ""),
+                }
     except Exception as err:  # noqa: BLE001
         _LOGGER.debug("ipinfo.io lookup failed for %s: %s", ip, err)
     return None
@@ -1,12 +1,13 @@
 """Sensor entities for Security Sentinel."""
 from __future__ import annotations
 
+import functools
 import logging
 from typing import Any
 
 from homeassistant.components.sensor import SensorEntity, SensorStateClass
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
@@ -28,6 +29,19 @@ _DEVICE_INFO_BASE = {
     "sw_version": VERSION,
 }
 
+# Shared stand-in for coordinator data before the first refresh; never mutated
+_EMPTY: dict[str, Any] = {}
+
+
+@functools.lru_cache(maxsize=16)
+def _device_info(entry_id: str) -> dict[str, Any]:
+    """Return the device info shared by all sensors of a config entry."""
+    return {
+        **_DEVICE_INFO_BASE,
+        "identifiers": {(DOMAIN, entry_id)},
+        "name": "Security Sentinel",
+    }
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -55,15 +69,25 @@ class _BaseSentinelSensor(CoordinatorEntity, SensorEntity):
     ) -> None:
         super().__init__(coordinator)
         self._attr_unique_id = f"{entry.entry_id}_{key}"
-        self._attr_device_info = {
-            **_DEVICE_INFO_BASE,
-            "identifiers": {(DOMAIN, entry.entry_id)},
-            "name": "Security Sentinel",
-        }
+        self._attr_device_info = _device_info(entry.entry_id)
+        self._update_from_data(self._data)
 
     @property
     def _data(self) -> dict[str, Any]:
-        return self.coordinator.data or {}
+        data = self.coordinator.data
+        return data if data is not None else _EMPTY
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Recompute state and attributes once per coordinator refresh."""
+        self._update_from_data(self._data)
+        super()._handle_coordinator_update()
+
+    def _update_from_data(self, data: dict[str, Any]) -> None:
+        """Set ``_attr_native_value`` and ``_attr_extra_state_attributes``.
+
+        Subclasses override this; the base sensor has no state of its own.
+        """
 
 
 class FailedLoginsSensor(_BaseSentinelSensor):
@@ -77,18 +101,14 @@ class FailedLoginsSensor(_BaseSentinelSensor):
     def __init__(self, coordinator: SecuritySentinelCoordinator, entry: ConfigEntry) -> None:
         super().__init__(coordinator, entry, SENSOR_FAILED_LOGINS)
 
-    @property
-    def native_value(self) -> int:
-        return self._data.get("failed_logins", 0)
-
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
-        last = self._data.get("last_event")
-        return {
+    def _update_from_data(self, data: dict[str, Any]) -> None:
+        last = data.get("last_event") or _EMPTY
+        self._attr_native_value = data.get("failed_logins", 0)
+        self._attr_extra_state_attributes = {
             "component_version": VERSION,
-            "last_ip": last.get("ip") if last else None,
-            "last_time": last.get("timestamp") if last else None,
-            "recent_events": self._data.get("recent_events", [])[:10],
+            "last_ip": last.get("ip"),
+            "last_time": last.get("timestamp"),
+            "recent_events": data.get("recent_events", []),
         }
 
 
@@ -101,18 +121,13 @@ class LastEventSensor(_BaseSentinelSensor):
     def __init__(self, coordinator: SecuritySentinelCoordinator, entry: ConfigEntry) -> None:
         super().__init__(coordinator, entry, SENSOR_LAST_EVENT)
 
-    @property
-    def native_value(self) -> str:
-        last = self._data.get("last_event")
-        return last.get("event_type", "None") if last else "None"
-
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
-        last = self._data.get("last_event") or {}
-        return {
+    def _update_from_data(self, data: dict[str, Any]) -> None:
+        last = data.get("last_event") or _EMPTY
+        self._attr_native_value = last.get("event_type", "None")
+        self._attr_extra_state_attributes = {
             "component_version": VERSION,
             "ip": last.get("ip"),
-            "geo": last.get("geo", {}),
+            "geo": last.get("geo") or _EMPTY,
             "detail": last.get("detail"),
             "severity": last.get("severity"),
             "timestamp": last.get("timestamp"),
@@ -128,16 +143,12 @@ class ThreatLevelSensor(_BaseSentinelSensor):
     def __init__(self, coordinator: SecuritySentinelCoordinator, entry: ConfigEntry) -> None:
         super().__init__(coordinator, entry, SENSOR_THREAT_LEVEL)
 
-    @property
-    def native_value(self) -> str:
-        return self._data.get("threat_level", "low")
-
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
-        return {
+    def _update_from_data(self, data: dict[str, Any]) -> None:
+        self._attr_native_value = data.get("threat_level", "low")
+        self._attr_extra_state_attributes = {
             "component_version": VERSION,
-            "total_events_loaded": self._data.get("total_events", 0),
-            "recent_events": self._data.get("recent_events", [])[:10],
+            "total_events_loaded": data.get("total_events", 0),
+            "recent_events": data.get("recent_events", []),
         }
 
 
@@ -148,16 +159,12 @@ class BannedIPsSensor(_BaseSentinelSensor):
     _attr_icon = "mdi:shield-lock"
     _attr_native_unit_of_measurement = "IPs"
     _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_extra_state_attributes = {
+        "component_version": VERSION,
+    }
 
     def __init__(self, coordinator: SecuritySentinelCoordinator, entry: ConfigEntry) -> None:
         super().__init__(coordinator, entry, SENSOR_BANNED_IPS)
 
-    @property
-    def native_value(self) -> int:
-        return len(self._data.get("banned_ips", []))
-
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
-        return {
-            "component_version": VERSION,
-        }
+    def _update_from_data(self, data: dict[str, Any]) -> None:
+        self._attr_native_value = len(data.get("banned_ips", []))
@@ -1,79 +1,251 @@
-"""Persistent event storage for Security Sentinel."""
+"""Persistent event storage for Security Sentinel.
+
+Events are kept in an append-only JSON Lines journal so that recording an
+event writes only that event; the journal is compacted back down to
+``MAX_STORED_EVENTS`` lines once it grows past twice that size.  Traceroute
+results remain in a regular Home Assistant ``Store``.
+"""
 from __future__ import annotations
 
+import asyncio
 import logging
-from datetime import datetime, timezone
+import os
+import re
+import sys
+import time
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+from pathlib import Path
 from typing import Any
 
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.storage import Store
+import orjson
+
+from homeassistant.const import EVENT_HOMEASSISTANT_FINAL_WRITE
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import STORAGE_DIR, Store
 
-from .const import STORAGE_KEY, STORAGE_VERSION
+from .const import JOURNAL_FILENAME, STORAGE_KEY, STORAGE_VERSION
 
 _LOGGER = logging.getLogger(__name__)
 
 MAX_STORED_EVENTS = 500
+SAVE_DELAY = 2  # seconds; bursts of events coalesce into one write
+
+# Timezone-aware ISO 8601 timestamps as written by datetime.isoformat()
+_ISO_RE = re.compile(
+    r"(\d{4})-(\d{2})-(\d{2})[T ](\d{2}):(\d{2}):(\d{2})(?:\.(\d{1,6}))?"
+    r"(?:([+-])(\d{2}):?(\d{2})|Z)$"
+)
 
 
 class EventStore:
-    """Manages persistent JSON-backed storage of security events."""
+    """Manages persistent storage of security events and traceroute data."""
 
     def __init__(self, hass: HomeAssistant) -> None:
+        self._hass = hass
         self._store = Store(hass, STORAGE_VERSION, STORAGE_KEY)
-        self._events: list[dict[str, Any]] = []
+        self._journal_path = Path(hass.config.path(STORAGE_DIR, JOURNAL_FILENAME))
+        self._events: deque[dict[str, Any]] = deque(maxlen=MAX_STORED_EVENTS)
         # Per-IP traceroute results: {ip: [{"ip": ..., "lat": ..., ...}, ...]}
         self._traceroute: dict[str, list[dict[str, Any]]] = {}
+        # Encoded journal lines not yet written, and lines already on disk
+        self._pending_lines: list[bytes] = []
+        self._journal_lines = 0
+        self._traceroute_dirty = False
+        self._flush_lock = asyncio.Lock()
+        self._unsub_flush: CALLBACK_TYPE | None = None
+        self._unsub_final_write: CALLBACK_TYPE | None = None
+        self._closed = False
 
     async def async_load(self) -> None:
-        """Load events from persistent storage."""
+        """Load events from the journal and traceroute data from storage."""
         data = await self._store.async_load()
-        if data and isinstance(data.get("events"), list):
-            self._events = data["events"]
+        events, clean = await self._hass.async_add_executor_job(self._read_journal)
+        if events is None and data and isinstance(data.get("events"), list):
+            # Migrate events saved by versions without the journal
+            events = [e for e in data["events"] if _is_valid_event(e)]
+            self._traceroute_dirty = True
+            clean = False
+        if events is not None:
+            # A damaged journal is rewritten in full on the next flush
+            self._journal_lines = len(events) if clean else -1
+        if events:
+            self._events = deque(events, maxlen=MAX_STORED_EVENTS)
+            for event in self._events:
+                if "_ts" not in event:
+                    event["_ts"] = self._parse_ts(event.get("timestamp", ""))
+                _intern_event_type(event)
             _LOGGER.debug("Loaded %d events from storage.", len(self._events))
         if data and isinstance(data.get("traceroute"), dict):
             self._traceroute = data["traceroute"]
             _LOGGER.debug(
                 "Loaded traceroute data for %d IPs.", len(self._traceroute)
             )
+        self._unsub_final_write = self._hass.bus.async_listen_once(
+            EVENT_HOMEASSISTANT_FINAL_WRITE, self._async_handle_final_write
+        )
+        if self._journal_lines < 0 or self._traceroute_dirty:
+            self.schedule_save()
 
     async def async_save(self) -> None:
-        """Persist events to storage (capped at MAX_STORED_EVENTS)."""
-        await self._store.async_save(
-            {
-                "events": self._events[-MAX_STORED_EVENTS:],
-                "traceroute": self._traceroute,
-            }
-        )
+        """Persist pending events and traceroute data immediately."""
+        if self._unsub_flush:
+            self._unsub_flush()
+            self._unsub_flush = None
+        await self._async_flush_journal()
+        if self._traceroute_dirty:
+            self._traceroute_dirty = False
+            await self._store.async_save(self._data_to_save())
+
+    async def async_close(self) -> None:
+        """Flush everything and stop listening for shutdown."""
+        self._closed = True
+        if self._unsub_final_write:
+            self._unsub_final_write()
+            self._unsub_final_write = None
+        await self.async_save()
+
+    @callback
+    def schedule_save(self) -> None:
+        """Persist pending changes after SAVE_DELAY, coalescing bursts.
+
+        Does nothing once the store is closed, so late callers cannot arm a
+        save that races the next entry's store.
+        """
+        if self._unsub_flush is None and not self._closed:
+            self._unsub_flush = async_call_later(
+                self._hass, SAVE_DELAY, self._async_scheduled_save
+            )
+
+    async def _async_scheduled_save(self, _now: datetime) -> None:
+        self._unsub_flush = None
+        await self.async_save()
+
+    async def _async_handle_final_write(self, _event: Event) -> None:
+        self._unsub_final_write = None
+        await self.async_save()
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        return {"traceroute": self._traceroute}
+
+    async def _async_flush_journal(self) -> None:
+        """Append pending lines, compacting the journal when it grows too long."""
+        async with self._flush_lock:
+            if not self._pending_lines and self._journal_lines >= 0:
+                return
+            lines, self._pending_lines = self._pending_lines, []
+            try:
+                if (
+                    self._journal_lines < 0
+                    or self._journal_lines + len(lines) > 2 * MAX_STORED_EVENTS
+                ):
+                    snapshot = [_encode(e) for e in self._events]
+                    await self._hass.async_add_executor_job(
+                        self._rewrite_journal, snapshot
+                    )
+                    self._journal_lines = len(snapshot)
+                else:
+                    await self._hass.async_add_executor_job(
+                        self._append_journal, lines
+                    )
+                    self._journal_lines += len(lines)
+            except BaseException:
+                # The journal may be missing lines or end in a torn one (also
+                # when cancelled mid-write); rewrite it from _events next time
+                self._journal_lines = -1
+                raise
+
+    # ------------------------------------------------------------------
+    # Blocking journal I/O (runs in executor)
+    # ------------------------------------------------------------------
+
+    def _read_journal(self) -> tuple[list[dict[str, Any]] | None, bool]:
+        """Return ``(events, clean)``; events is None when no journal exists.
+
+        *clean* is False when a line is not a valid event or the file does not
+        end with a newline (e.g. after an interrupted write).
+        """
+        try:
+            raw = self._journal_path.read_bytes()
+        except FileNotFoundError:
+            return None, True
+        clean = not raw or raw.endswith(b"\n")
+        events: list[dict[str, Any]] = []
+        for line in raw.splitlines():
+            if not line.strip():
+                continue
+            try:
+                event = orjson.loads(line)
+            except orjson.JSONDecodeError:
+                event = None
+            if not _is_valid_event(event):
+                clean = False
+                _LOGGER.warning("Skipping corrupt line in %s", self._journal_path)
+                continue
+            events.append(event)
+        return events, clean
 
-    def add_event(self, event: dict[str, Any]) -> None:
-        """Add a new security event, stamping timestamp if missing."""
+    def _append_journal(self, lines: list[bytes]) -> None:
+        with self._journal_path.open("ab") as fh:
+            fh.write(b"".join(lines))
+            fh.flush()
+            os.fsync(fh.fileno())
+
+    def _rewrite_journal(self, lines: list[bytes]) -> None:
+        tmp_path = self._journal_path.with_suffix(".tmp")
+        self._journal_path.parent.mkdir(parents=True, exist_ok=True)
+        with tmp_path.open("wb") as fh:
+            fh.write(b"".join(lines))
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp_path, self._journal_path)
+
+    def add_event(
+        self, event: dict[str, Any], *, now: float | None = None
+    ) -> None:
+        """Add a new security event, stamping timestamp if missing.
+
+        The numeric ``_ts`` (Unix seconds) is stored alongside the ISO string
+        so time-window queries never have to parse timestamps; producers that
+        already set both skip the parse.  *now* is used for the stamp when
+        given.  Call :meth:`schedule_save` to persist it.
+        """
         if "timestamp" not in event:
-            event["timestamp"] = datetime.now(timezone.utc).isoformat()
+            if now is None:
+                now = time.time()
+            event["timestamp"] = datetime.fromtimestamp(now, tz=timezone.utc).isoformat()
+            event["_ts"] = now
+        elif "_ts" not in event:
+            event["_ts"] = self._parse_ts(event["timestamp"])
+        _intern_event_type(event)
+        # Encode first: an unserializable event must not reach the store
+        line = _encode(event)
         self._events.append(event)
-        if len(self._events) > MAX_STORED_EVENTS:
-            self._events = self._events[-MAX_STORED_EVENTS:]
-
-    def get_recent_events(self, hours: int = 24, limit: int = 50) -> list[dict[str, Any]]:
-        """Return events from the last N hours, newest first."""
-        cutoff = datetime.now(timezone.utc).timestamp() - (hours * 3600)
-        recent = [
-            e for e in self._events
-            if self._parse_ts(e.get("timestamp", "")) >= cutoff
-        ]
-        return list(reversed(recent[-limit:]))
+        self._pending_lines.append(line)
+
+    def get_recent_events(
+        self, hours: int = 24, limit: int = 50, *, now: float | None = None
+    ) -> list[dict[str, Any]]:
+        """Return events from the last N hours before *now*, newest first.
+
+        Events are not guaranteed to be stored in ``_ts`` order (concurrent
+        processing, clock jumps), so every stored event is checked.
+        """
+        cutoff = (time.time() if now is None else now) - (hours * 3600)
+        return list(
+            islice((e for e in reversed(self._events) if e["_ts"] >= cutoff), limit)
+        )
 
     def get_all_events(self, limit: int = 100) -> list[dict[str, Any]]:
         """Return all stored events, newest first."""
-        return list(reversed(self._events[-limit:]))
-
-    def count_failed_logins(self, hours: int = 24) -> int:
-        """Count AUTH_FAILED events in the last N hours."""
-        cutoff = datetime.now(timezone.utc).timestamp() - (hours * 3600)
-        return sum(
-            1 for e in self._events
-            if e.get("event_type") == "AUTH_FAILED"
-            and self._parse_ts(e.get("timestamp", "")) >= cutoff
-        )
+        return list(islice(reversed(self._events), limit))
+
+    def count_events(self) -> int:
+        """Return the number of stored events."""
+        return len(self._events)
 
     def get_last_event(self) -> dict[str, Any] | None:
         """Return the most recent event or None."""
@@ -81,7 +253,7 @@ class EventStore:
 
     def get_events_by_ip(self, ip: str) -> list[dict[str, Any]]:
         """Return all stored events for a specific IP, newest first."""
-        return list(reversed([e for e in self._events if e.get("ip") == ip]))
+        return [e for e in reversed(self._events) if e.get("ip") == ip]
 
     def get_latest_geo_for_ip(self, ip: str) -> dict[str, Any]:
         """Return the most recently recorded geo snapshot for an IP."""
@@ -100,6 +272,7 @@ class EventStore:
     def set_traceroute(self, ip: str, hops: list[dict[str, Any]]) -> None:
         """Store geo-enriched traceroute hops for *ip*."""
         self._traceroute[ip] = hops
+        self._traceroute_dirty = True
 
     def get_traceroute(self, ip: str) -> list[dict[str, Any]]:
         """Return stored traceroute hops for *ip*, or an empty list."""
@@ -108,7 +281,56 @@ class EventStore:
     @staticmethod
     def _parse_ts(ts: str) -> float:
         """Parse ISO timestamp string to Unix float, return 0.0 on failure."""
+        match = _ISO_RE.match(ts) if isinstance(ts, str) else None
+        if match:
+            year, month, day, hour, minute, second, frac, sign, off_h, off_m = (
+                match.groups()
+            )
+            tz = timezone.utc
+            if sign:
+                offset = timedelta(hours=int(off_h), minutes=int(off_m))
+                tz = timezone(-offset if sign == "-" else offset)
+            try:
+                return datetime(
+                    int(year), int(month), int(day),
+                    int(hour), int(minute), int(second),
+                    int(frac.ljust(6, "0")) if frac else 0,
+                    tzinfo=tz,
+                ).timestamp()
+            except ValueError:
+                return 0.0
         try:
             return datetime.fromisoformat(ts).timestamp()
         except (ValueError, TypeError):
             return 0.0
+
+
+def public_event(event: dict[str, Any]) -> dict[str, Any]:
+    """Return a copy of *event* without the store's internal ``_ts`` field."""
+    return {key: value for key, value in event.items() if key != "_ts"}
+
+
+def _is_valid_event(event: Any) -> bool:
+    """Return True if *event* has the fields every stored event relies on."""
+    return (
+        isinstance(event, dict)
+        and isinstance(event.get("event_type"), str)
+        and isinstance(event.get("timestamp"), str)
+        and isinstance(event.get("_ts", 0.0), (int, float))
+    )
+
+
+def _intern_event_type(event: dict[str, Any]) -> None:
+    """Intern *event*'s ``event_type`` in place when it is a string.
+
+    Event types form a tiny alphabet, so interning lets every stored event
+    share one string object per type.
+    """
+    event_type = event.get("event_type")
+    if isinstance(event_type, str):
+        event["event_type"] = sys.intern(event_type)
+
+
+def _encode(event: dict[str, Any]) -> bytes:
+    """Serialize one event as a journal line."""
+    return orjson.dumps(event) + b"\n"